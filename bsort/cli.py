@@ -1,9 +1,5 @@
 import click
 
-from .data_augmentation import run_augmentation
-from .inference import run_inference
-from .model_train import run_training
-
 
 @click.group()
 def cli():
@@ -17,6 +13,8 @@ def cli():
 @click.option("--force", is_flag=True, help="Force re-augmentation even if exists")
 def augment(config, split, force):
     """Run data augmentation on training images."""
+    from .data_augmentation import run_augmentation
+
     run_augmentation(config, split, force)
 
 
@@ -28,6 +26,8 @@ def augment(config, split, force):
 @click.option("--imgsz", default=None, type=int, help="Image size")
 def train(config, epochs, device, batch, imgsz):
     """Train YOLO model."""
+    from .model_train import run_training
+
     run_training(config, epochs, device, batch, imgsz)
 
 
@@ -41,6 +41,8 @@ def train(config, epochs, device, batch, imgsz):
 @click.option("--show", is_flag=True, help="Display results with matplotlib")
 def infer(config, image, dir, model, conf, save, show):
     """Run inference on image(s)."""
+    from .inference import run_inference
+
     run_inference(config, image, dir, model, conf, save, show)
 
 
@@ -1,18 +1,506 @@
+import math
 import os
 import random
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import albumentations as A
 import click
 import cv2
 import numpy as np
-from tqdm import tqdm
 
 # from dotenv import load_dotenv
-from bsort.helper import read_yolo_label, write_yolo_label
+from bsort.helper import IOConsumer, PrefetchReader
 
-from .helper import load_config
+from .helper import get_cv2_threads, list_images, load_config, progress_bar
+
+# keep OpenCV on the calling thread unless BSORT_CV2_THREADS says otherwise
+cv2.setNumThreads(get_cv2_threads())
+
+# source image paired with the augmentation indices still to produce
+AugJob = Tuple[Path, List[int]]
+
+# maximum number of images handed to a worker at once
+BATCH_SIZE: int = 8
+
+_transform: Optional[A.Compose] = None
+_aug_settings: Dict[str, Any] = {}
+_rng: np.random.Generator = np.random.default_rng()
+_jpeg_quality: int = 85
+
+
+def _hashable(value: Any) -> Any:
+    """Convert YAML lists to tuples so settings can be used as cache keys."""
+    return tuple(value) if isinstance(value, list) else value
+
+
+@lru_cache(maxsize=8)
+def _compose_transform(
+    horizontal_flip: float,
+    vertical_flip: float,
+    rotation_limit: Any,
+    brightness_contrast: float,
+    blur: float,
+    shift_limit: Any,
+    scale_limit: Any,
+) -> A.Compose:
+    """Compose the albumentations pipeline, leaving out steps that never apply."""
+    transforms: List[A.BasicTransform] = []
+    if horizontal_flip:
+        transforms.append(A.HorizontalFlip(p=horizontal_flip))
+    if vertical_flip:
+        transforms.append(A.VerticalFlip(p=vertical_flip))
+    if rotation_limit:
+        transforms.append(A.Rotate(limit=rotation_limit, p=0.5))
+    if brightness_contrast:
+        transforms.append(A.RandomBrightnessContrast(p=brightness_contrast))
+    if blur:
+        transforms.append(A.Blur(blur_limit=3, p=blur))
+    transforms.append(A.ColorJitter(p=0.2))
+    transforms.append(
+        A.ShiftScaleRotate(shift_limit=shift_limit, scale_limit=scale_limit, rotate_limit=15, p=0.5)
+    )
+
+    return A.Compose(
+        transforms, bbox_params=A.BboxParams(format="yolo", label_fields=["class_labels"])
+    )
+
+
+def _build_transform(aug_settings: Dict[str, Any]) -> A.Compose:
+    """Build the albumentations pipeline from the augmentation settings.
+
+    Transforms with a zero probability or zero limit are left out, and the
+    result is cached on the settings that affect it.
+
+    Args:
+        aug_settings: The ``augmentation`` section of the configuration.
+
+    Returns:
+        Composed transform operating on images and YOLO format bounding boxes.
+    """
+    return _compose_transform(
+        _hashable(aug_settings.get("horizontal_flip", 0)),
+        _hashable(aug_settings.get("vertical_flip", 0)),
+        _hashable(aug_settings.get("rotation_limit", 0)),
+        _hashable(aug_settings.get("brightness_contrast", 0)),
+        _hashable(aug_settings.get("blur", 0)),
+        _hashable(aug_settings.get("shift_limit", 0)),
+        _hashable(aug_settings.get("scale_limit", 0)),
+    )
+
+
+def _init_worker(aug_settings: Dict[str, Any]) -> None:
+    """Initialize an augmentation worker process.
+
+    Builds the transform once per worker, or reuses the one inherited from the
+    parent process when workers are forked. The transform's random state is
+    reseeded either way so workers don't repeat each other's samples. OpenCV
+    threading is already configured at import time from ``BSORT_CV2_THREADS``.
+
+    Args:
+        aug_settings: The ``augmentation`` section of the configuration.
+    """
+    global _transform, _aug_settings, _rng, _jpeg_quality
+    # forked workers inherit the parent's random state, so draw fresh entropy
+    _rng = np.random.Generator(np.random.PCG64())
+    _transform = _build_transform(aug_settings)
+    _transform.set_random_state(_rng, random.Random())
+    _aug_settings = aug_settings
+    _jpeg_quality = aug_settings.get("jpeg_quality", 85)
+
+
+def _output_seed(seed: int, img_path: Path, index: int) -> List[int]:
+    """Return the seed entropy for one augmented output.
+
+    Args:
+        seed: The ``augmentation.seed`` setting.
+        img_path: Path of the source image.
+        index: Augmentation index of the output.
+
+    Returns:
+        Entropy for ``np.random.PCG64``, unique to the image name and index.
+    """
+    return [seed, zlib.crc32(img_path.name.encode()), index]
+
+
+def _output_rng(img_path: Path, index: int) -> np.random.Generator:
+    """Return the random generator used to produce one augmented output.
+
+    With ``augmentation.seed`` set, the generator is derived from the seed, the
+    image file name and the output index, and the transform is reseeded from
+    it. Each output is then reproducible on its own, regardless of which worker
+    handles it or which other outputs are produced in the same run. Otherwise
+    the worker's own generator is used.
+
+    Args:
+        img_path: Path of the source image.
+        index: Augmentation index of the output.
+
+    Returns:
+        PCG64-backed generator for sampling augmentation parameters.
+    """
+    seed: Optional[int] = _aug_settings.get("seed")
+    if seed is None:
+        return _rng
+
+    rng: np.random.Generator = np.random.Generator(
+        np.random.PCG64(_output_seed(seed, img_path, index))
+    )
+    _transform.set_random_state(rng, random.Random(int(rng.integers(2**63))))
+    return rng
+
+
+def _limit_range(limit: Any) -> Tuple[float, float]:
+    """Normalize a scalar-or-range limit the way albumentations does.
+
+    Args:
+        limit: Either a single number ``x``, meaning ``(-x, x)``, or a
+            ``(low, high)`` pair.
+
+    Returns:
+        The ``(low, high)`` range to sample from.
+    """
+    if isinstance(limit, (list, tuple)):
+        low, high = limit
+        return float(low), float(high)
+    return -float(limit), float(limit)
+
+
+def _fast_geom_aug(
+    image: np.ndarray,
+    rng: np.random.Generator,
+    cfg: Dict[str, Any],
+    bufs: Tuple[np.ndarray, np.ndarray],
+) -> np.ndarray:
+    """Augment an image without bounding boxes using OpenCV directly.
+
+    Mirrors the albumentations pipeline from ``_build_transform`` for images
+    that have no labels, skipping its bounding box bookkeeping. The rotation
+    and shift-scale-rotate steps are folded into a single ``cv2.warpAffine``.
+    Intermediate results ping-pong between two preallocated buffers, so only
+    the returned image is newly allocated.
+
+    Args:
+        image: Source image in BGR channel order.
+        rng: Random generator used to sample the augmentation parameters.
+        cfg: The ``augmentation`` section of the configuration.
+        bufs: Two scratch arrays with the same shape and dtype as ``image``.
+
+    Returns:
+        The augmented image.
+    """
+    h, w = image.shape[:2]
+    buf_a, buf_b = bufs
+    out: np.ndarray = image
+
+    def dst() -> np.ndarray:
+        return buf_b if out is buf_a else buf_a
+
+    if rng.random() < cfg.get("horizontal_flip", 0):
+        out = cv2.flip(out, 1, dst=dst())
+    if rng.random() < cfg.get("vertical_flip", 0):
+        out = cv2.flip(out, 0, dst=dst())
+
+    rotation_range: Tuple[float, float] = _limit_range(cfg.get("rotation_limit", 0))
+    shift_range: Tuple[float, float] = _limit_range(cfg.get("shift_limit", 0))
+    scale_range: Tuple[float, float] = _limit_range(cfg.get("scale_limit", 0))
+
+    angle: float = 0.0
+    scale: float = 1.0
+    dx: float = 0.0
+    dy: float = 0.0
+    if rng.random() < 0.5:
+        angle += rng.uniform(*rotation_range)
+    if rng.random() < 0.5:
+        angle += rng.uniform(-15, 15)
+        scale += rng.uniform(*scale_range)
+        dx, dy = rng.uniform(*shift_range, size=2)
+    if angle or scale != 1.0 or dx or dy:
+        M: np.ndarray = cv2.getRotationMatrix2D((w / 2, h / 2), angle, scale)
+        M[:, 2] += (dx * w, dy * h)
+        out = cv2.warpAffine(
+            out,
+            M,
+            (w, h),
+            dst=dst(),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+        )
+
+    if rng.random() < cfg.get("brightness_contrast", 0):
+        alpha: float = 1 + rng.uniform(-0.2, 0.2)
+        out = cv2.addWeighted(out, alpha, out, 0, rng.uniform(-0.2, 0.2) * 255, dst=dst())
+    if rng.random() < cfg.get("blur", 0):
+        out = cv2.blur(out, (3, 3), dst=dst())
+    if rng.random() < 0.2:
+        # color jitter: brightness, contrast, then saturation and hue in HSV space
+        brightness: float = rng.uniform(0.8, 1.2)
+        contrast: float = rng.uniform(0.8, 1.2)
+        b, g, r, _ = cv2.mean(out)
+        mean: float = 0.114 * b + 0.587 * g + 0.299 * r
+        out = cv2.addWeighted(
+            out, brightness * contrast, out, 0, mean * brightness * (1 - contrast), dst=dst()
+        )
+        out = cv2.cvtColor(out, cv2.COLOR_BGR2HSV, dst=dst())
+        # hue rotation and saturation scaling in one lookup table pass
+        levels: np.ndarray = np.arange(256, dtype=np.float32)
+        lut: np.ndarray = np.stack(
+            [
+                (levels + int(rng.uniform(-0.5, 0.5) * 180)) % 180,
+                np.clip(levels * rng.uniform(0.8, 1.2), 0, 255),
+                levels,
+            ],
+            axis=-1,
+        ).astype(np.uint8)
+        out = cv2.LUT(out, lut.reshape(256, 1, 3), dst=dst())
+        out = cv2.cvtColor(out, cv2.COLOR_HSV2BGR, dst=dst())
+
+    # the result is handed to the writer threads, so it can't stay in a scratch buffer
+    return out.copy() if out is buf_a or out is buf_b else out
+
+
+def _augment_batch(task: Tuple[List[AugJob], Path, Path, Path]) -> int:
+    """Augment a batch of images and write the missing outputs for each.
+
+    Images are decoded ahead of time by a PrefetchReader and the outputs are
+    written by an IOConsumer, so disk I/O overlaps with the transforms.
+
+    Args:
+        task: Tuple of (jobs, lbl_dir, out_img_dir, out_lbl_dir), where each job
+            pairs an image path with the augmentation indices to produce.
+
+    Returns:
+        Number of source images processed.
+    """
+    jobs, lbl_dir, out_img_dir, out_lbl_dir = task
+    indices: Dict[Path, List[int]] = dict(jobs)
+
+    bufs: Tuple[np.ndarray, np.ndarray] = (np.empty(0, np.uint8), np.empty(0, np.uint8))
+
+    with IOConsumer(jpeg_quality=_jpeg_quality) as writer:
+        for img_path, image, bboxes, classes in PrefetchReader(list(indices), lbl_dir):
+            if image is None:
+                click.echo(f"Warning: Could not read {img_path}")
+                continue
+
+            # scratch space for the OpenCV path, reused while image sizes match
+            if not bboxes and bufs[0].shape != image.shape:
+                bufs = (np.empty_like(image), np.empty_like(image))
+
+            # every sample draws its own parameters, so a batched call with shared
+            # parameters would only produce identical copies; instead convert the
+            # labels once so albumentations doesn't rebuild them on each call
+            bbox_arr: np.ndarray = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+            class_arr: np.ndarray = np.asarray(classes, dtype=np.int64)
+
+            for i in indices[img_path]:
+                try:
+                    rng: np.random.Generator = _output_rng(img_path, i)
+                    if bboxes:
+                        aug: Dict[str, Any] = _transform(
+                            image=image, bboxes=bbox_arr, class_labels=class_arr
+                        )
+                    else:
+                        # nothing to keep in sync with the image, skip albumentations
+                        aug = {
+                            "image": _fast_geom_aug(image, rng, _aug_settings, bufs),
+                            "bboxes": [],
+                            "class_labels": [],
+                        }
+                    out_name: str = img_path.stem + f"_aug{i}"
+
+                    writer.put(
+                        {
+                            "out_path": out_img_dir / f"{out_name}.jpg",
+                            "img": aug["image"],
+                            "label_path": out_lbl_dir / f"{out_name}.txt",
+                            "bboxes": aug["bboxes"],
+                            "classes": aug["class_labels"],
+                        }
+                    )
+                except Exception as e:
+                    click.echo(
+                        f"Warning: Augmentation failed for {img_path.name} " f"(aug {i}): {e}"
+                    )
+                    continue
+
+    for out_path, e in writer.errors:
+        click.echo(f"Warning: Could not write {out_path}: {e}")
+
+    return len(jobs)
+
+
+def _build_gpu_transform(aug_settings: Dict[str, Any]) -> Any:
+    """Build the kornia counterpart of the albumentations pipeline.
+
+    Args:
+        aug_settings: The ``augmentation`` section of the configuration.
+
+    Returns:
+        ``kornia.augmentation.AugmentationSequential`` operating on image batches
+        and pixel ``xywh`` bounding boxes.
+    """
+    import kornia.augmentation as K
+
+    scale_low, scale_high = _limit_range(aug_settings.get("scale_limit", 0))
+    # kornia translates symmetrically, so use the larger side of the range
+    shift: float = max(map(abs, _limit_range(aug_settings.get("shift_limit", 0))))
+
+    return K.AugmentationSequential(
+        K.RandomHorizontalFlip(p=aug_settings.get("horizontal_flip", 0)),
+        K.RandomVerticalFlip(p=aug_settings.get("vertical_flip", 0)),
+        K.RandomAffine(
+            degrees=_limit_range(aug_settings.get("rotation_limit", 0)),
+            translate=(shift, shift),
+            scale=(1 + scale_low, 1 + scale_high),
+            p=0.5,
+        ),
+        K.ColorJitter(brightness=0.2, contrast=0.2, p=aug_settings.get("brightness_contrast", 0)),
+        K.RandomGaussianBlur((3, 3), (0.1, 2.0), p=aug_settings.get("blur", 0)),
+        K.ColorJitter(0.2, 0.2, 0.2, 0.2, p=0.2),
+        data_keys=["input", "bbox_xywh"],
+        same_on_batch=False,
+    )
+
+
+def _augment_gpu(
+    jobs: List[AugJob],
+    lbl_dir: Path,
+    out_img_dir: Path,
+    out_lbl_dir: Path,
+    aug_settings: Dict[str, Any],
+    desc: str,
+) -> None:
+    """Augment images on the GPU with kornia.
+
+    Each source image is uploaded once and replicated once per missing output, so one
+    batched call produces every augmented copy with independently sampled
+    parameters. The upload and batch buffers are allocated once and reused
+    for every image of the same size. With ``augmentation.seed`` set, each
+    output is transformed separately from its own seed instead, so resumed
+    runs reproduce exactly the outputs that were missing.
+
+    Args:
+        jobs: Source image paths paired with the augmentation indices to produce.
+        lbl_dir: Directory containing the source YOLO labels.
+        out_img_dir: Output directory for augmented images.
+        out_lbl_dir: Output directory for augmented labels.
+        aug_settings: The ``augmentation`` section of the configuration.
+        desc: Progress bar description.
+
+    Raises:
+        click.Abort: If torch or kornia are not installed, or CUDA is unavailable.
+    """
+    try:
+        import torch
+    except ImportError:
+        click.echo(click.style("GPU augmentation requires torch and kornia", fg="red"))
+        raise click.Abort()
+
+    device: str = aug_settings.get("device", "cuda")
+    if not torch.cuda.is_available():
+        click.echo(click.style(f"CUDA is not available for device '{device}'", fg="red"))
+        raise click.Abort()
+
+    seed: Optional[int] = aug_settings.get("seed")
+
+    try:
+        transform = _build_gpu_transform(aug_settings).to(device)
+    except ImportError:
+        click.echo(click.style("GPU augmentation requires kornia (pip install kornia)", fg="red"))
+        raise click.Abort()
+
+    indices: Dict[Path, List[int]] = dict(jobs)
+    src_buf: Optional[Any] = None
+    batch: Optional[Any] = None
+
+    with IOConsumer(jpeg_quality=aug_settings.get("jpeg_quality", 85)) as writer:
+        for img_path, image, bboxes, classes in progress_bar(
+            PrefetchReader(list(indices), lbl_dir), total=len(jobs), desc=desc
+        ):
+            if image is None:
+                click.echo(f"Warning: Could not read {img_path}")
+                continue
+
+            h, w = image.shape[:2]
+            n_aug: int = len(indices[img_path])
+            # device buffers are reused while consecutive images share a shape
+            if src_buf is None or src_buf.shape != image.shape or len(batch) != n_aug:
+                src_buf = torch.empty(image.shape, dtype=torch.uint8, device=device)
+                batch = torch.empty((n_aug, 3, h, w), dtype=torch.float32, device=device)
+
+            # BGR uint8 HWC -> RGB float NCHW, replicated once per augmented copy
+            src_buf.copy_(torch.from_numpy(image))
+            batch[0].copy_(src_buf.permute(2, 0, 1).flip(0))
+            batch[0].div_(255)
+            batch[1:].copy_(batch[0])
+
+            if bboxes:
+                yolo = torch.tensor(bboxes, dtype=torch.float32, device=device)
+                scale = torch.tensor([w, h, w, h], dtype=torch.float32, device=device)
+                boxes = yolo * scale
+                boxes[:, :2] -= boxes[:, 2:] / 2
+                boxes = boxes.unsqueeze(0).repeat(n_aug, 1, 1)
+            else:
+                boxes = torch.zeros((n_aug, 0, 4), device=device)
+
+            with torch.no_grad():
+                if seed is None:
+                    chunks = [(batch, boxes)]
+                else:
+                    # seeded runs transform each output on its own generator state, so
+                    # an output doesn't depend on which other indices are missing
+                    chunks = [(batch[j : j + 1], boxes[j : j + 1]) for j in range(n_aug)]
+
+                outs: List[Any] = []
+                out_boxes_list: List[Any] = []
+                for j, (images_in, boxes_in) in enumerate(chunks):
+                    if seed is not None:
+                        index: int = indices[img_path][j]
+                        seed_seq = np.random.SeedSequence(_output_seed(seed, img_path, index))
+                        torch.manual_seed(int(seed_seq.generate_state(1)[0]))
+                    if bboxes:
+                        chunk_out, chunk_boxes = transform(images_in, boxes_in)
+                    else:
+                        chunk_out, chunk_boxes = transform(images_in, data_keys=["input"]), boxes_in
+                    outs.append(chunk_out)
+                    out_boxes_list.append(chunk_boxes)
+                out = torch.cat(outs)
+                out_boxes = torch.cat(out_boxes_list)
+
+            out_imgs: np.ndarray = (
+                out.flip(1).clamp_(0, 1).mul_(255).round_().byte().permute(0, 2, 3, 1).cpu().numpy()
+            )
+
+            # pixel xywh -> clipped xyxy -> normalized YOLO, dropping boxes pushed out of frame
+            x1 = out_boxes[..., 0].clamp(0, w)
+            y1 = out_boxes[..., 1].clamp(0, h)
+            x2 = (out_boxes[..., 0] + out_boxes[..., 2]).clamp(0, w)
+            y2 = (out_boxes[..., 1] + out_boxes[..., 3]).clamp(0, h)
+            keep = ((x2 - x1) > 1) & ((y2 - y1) > 1)
+            yolo_boxes = torch.stack(
+                [(x1 + x2) / 2 / w, (y1 + y2) / 2 / h, (x2 - x1) / w, (y2 - y1) / h], dim=-1
+            )
+            yolo_boxes_np: np.ndarray = yolo_boxes.cpu().numpy()
+            keep_np: np.ndarray = keep.cpu().numpy()
+
+            for j, i in enumerate(indices[img_path]):
+                out_name: str = img_path.stem + f"_aug{i}"
+                writer.put(
+                    {
+                        "out_path": out_img_dir / f"{out_name}.jpg",
+                        "img": np.ascontiguousarray(out_imgs[j]),
+                        "label_path": out_lbl_dir / f"{out_name}.txt",
+                        "bboxes": yolo_boxes_np[j][keep_np[j]].tolist(),
+                        "classes": [c for c, k in zip(classes, keep_np[j]) if k],
+                    }
+                )
+
+    for out_path, e in writer.errors:
+        click.echo(f"Warning: Could not write {out_path}: {e}")
 
 
 def run_augmentation(config_path: str, split: str = "train", force: bool = False) -> None:
@@ -27,7 +515,8 @@ def run_augmentation(config_path: str, split: str = "train", force: bool = False
         split: Dataset split to augment (e.g., 'train', 'val', 'test').
             Defaults to 'train'.
         force: If True, removes existing augmented images and re-augments.
-            If False, skips augmentation if output directory already contains files.
+            If False, only the outputs that don't exist yet are produced, so
+            interrupted runs resume and newly added images are augmented.
             Defaults to False.
 
     Raises:
@@ -45,10 +534,16 @@ def run_augmentation(config_path: str, split: str = "train", force: bool = False
         >>> run_augmentation('config.yaml', split='val', force=True)
 
     Note:
-        - The function expects images in JPG format and labels in YOLO format.
+        - The function expects .jpg, .jpeg, .png, .bmp or .webp images (see
+          ``IMAGE_SUFFIXES``) and labels in YOLO format.
         - Augmented images are saved with suffix '_aug{i}.jpg' where i is the
           augmentation index.
         - The function uses the albumentations library for transformations.
+        - Images are augmented in parallel across ``augmentation.num_workers``
+          processes, defaulting to the number of CPU cores.
+        - Setting ``augmentation.device`` to ``cuda`` runs the pipeline on the GPU
+          with kornia instead, which must be installed separately.
+        - Setting ``augmentation.seed`` makes the output reproducible.
     """
     click.echo(click.style("\n=== Data Augmentation ===", fg="cyan", bold=True))
 
@@ -71,82 +566,77 @@ def run_augmentation(config_path: str, split: str = "train", force: bool = False
         out_img_dir.mkdir(parents=True, exist_ok=True)
         out_lbl_dir.mkdir(parents=True, exist_ok=True)
 
-        existing_count: int = len(list(out_img_dir.glob("*")))
-        if existing_count > 0 and not force:
-            click.echo(
-                click.style(
-                    f"✓ Augmented images already exist ({existing_count} files). Use --force to re-augment.",
-                    fg="yellow",
-                )
-            )
-            return
-
-        if force and existing_count > 0:
-            click.echo(f"Removing existing augmented images...")
-            for f in out_img_dir.glob("*"):
-                f.unlink()
-            for f in out_lbl_dir.glob("*"):
-                f.unlink()
-
-        # augmentation config
-        transform: A.Compose = A.Compose(
-            [
-                A.HorizontalFlip(p=aug_settings.get("horizontal_flip", 0)),
-                A.VerticalFlip(p=aug_settings.get("vertical_flip", 0)),
-                A.Rotate(limit=aug_settings.get("rotation_limit", 0), p=0.5),
-                A.RandomBrightnessContrast(p=aug_settings.get("brightness_contrast", 0)),
-                A.Blur(blur_limit=3, p=aug_settings.get("blur", 0)),
-                A.ColorJitter(p=0.2),
-                A.ShiftScaleRotate(
-                    shift_limit=aug_settings.get("shift_limit", 0),
-                    scale_limit=aug_settings.get("scale_limit", 0),
-                    rotate_limit=15,
-                    p=0.5,
-                ),
-            ],
-            bbox_params=A.BboxParams(format="yolo", label_fields=["class_labels"]),
-        )
+        if force:
+            removed: int = 0
+            for out_dir in (out_img_dir, out_lbl_dir):
+                with os.scandir(out_dir) as it:
+                    for entry in it:
+                        os.unlink(entry.path)
+                        removed += 1
+            if removed:
+                click.echo("Removed existing augmented images")
 
-        images: list[Path] = sorted(list(img_dir.glob("*.jpg")))
+        images: list[Path] = [Path(p) for p in list_images(str(img_dir))]
 
         if not images:
             click.echo(click.style(f"✗ No images found in {img_dir}", fg="red"))
             raise click.Abort()
 
-        click.echo(f"\nProcessing {len(images)} images...")
-        click.echo(f"Augmentations per image: {n_aug}")
-        click.echo(f"Total output images: {len(images) * n_aug}\n")
+        # one listing per output directory instead of a stat call per expected output
+        with os.scandir(out_img_dir) as it:
+            existing: Set[str] = {e.name for e in it}
+        with os.scandir(out_lbl_dir) as it:
+            existing &= {f"{Path(e.name).stem}.jpg" for e in it}
 
-        for img_path in tqdm(images, desc=f"Augmenting {split}"):
-            label_path: Path = lbl_dir / img_path.with_suffix(".txt").name
+        jobs: List[AugJob] = []
+        for img_path in images:
+            missing: List[int] = [
+                i for i in range(n_aug) if f"{img_path.stem}_aug{i}.jpg" not in existing
+            ]
+            if missing:
+                jobs.append((img_path, missing))
 
-            image: Optional[np.ndarray] = cv2.imread(str(img_path))
-            if image is None:
-                click.echo(f"Warning: Could not read {img_path}")
-                continue
+        n_todo: int = sum(len(missing) for _, missing in jobs)
+        if n_todo == 0:
+            click.echo(
+                click.style(
+                    "✓ Augmented images already exist. Use --force to re-augment.",
+                    fg="yellow",
+                )
+            )
+            return
 
-            bboxes, classes = read_yolo_label(str(label_path))
+        num_workers: int = aug_settings.get("num_workers") or os.cpu_count() or 1
+        use_gpu: bool = str(aug_settings.get("device", "cpu")).startswith("cuda")
 
-            for i in range(n_aug):
-                try:
-                    aug: Dict[str, Any] = transform(
-                        image=image, bboxes=bboxes, class_labels=classes
-                    )
-                    aug_img: np.ndarray = aug["image"]
-                    aug_bboxes: list = aug["bboxes"]
-                    aug_classes: list = aug["class_labels"]
+        click.echo(f"\nProcessing {len(jobs)} images...")
+        click.echo(f"Augmentations per image: {n_aug}")
+        click.echo(f"Total output images: {len(images) * n_aug}")
+        if n_todo < len(images) * n_aug:
+            click.echo(f"Resuming: {len(images) * n_aug - n_todo} outputs already exist")
+        if use_gpu:
+            click.echo(f"Device: {aug_settings['device']}\n")
+            _augment_gpu(
+                jobs, lbl_dir, out_img_dir, out_lbl_dir, aug_settings, f"Augmenting {split}"
+            )
+        else:
+            click.echo(f"Workers: {num_workers}\n")
 
-                    out_name: str = img_path.stem + f"_aug{i}.jpg"
+            # keep every worker busy on small datasets
+            batch_size: int = max(1, min(BATCH_SIZE, math.ceil(len(jobs) / num_workers)))
+            tasks: List[Tuple[List[AugJob], Path, Path, Path]] = [
+                (jobs[i : i + batch_size], lbl_dir, out_img_dir, out_lbl_dir)
+                for i in range(0, len(jobs), batch_size)
+            ]
 
-                    cv2.imwrite(str(out_img_dir / out_name), aug_img)
-                    write_yolo_label(
-                        str(out_lbl_dir / out_name.replace(".jpg", ".txt")), aug_bboxes, aug_classes
-                    )
-                except Exception as e:
-                    click.echo(
-                        f"Warning: Augmentation failed for {img_path.name} " f"(aug {i}): {e}"
-                    )
-                    continue
+            # fail early on invalid settings; forked workers also inherit the cached
+            # transform, while spawned ones rebuild it since A.Compose doesn't pickle cheaply
+            _build_transform(aug_settings)
+            with ProcessPoolExecutor(
+                max_workers=num_workers, initializer=_init_worker, initargs=(aug_settings,)
+            ) as executor, progress_bar(total=len(jobs), desc=f"Augmenting {split}") as pbar:
+                for done in executor.map(_augment_batch, tasks):
+                    pbar.update(done)
 
         click.echo(click.style("Augmentation completed!", fg="green", bold=True))
         click.echo(f"Output directory: {augment_dir / split}")
@@ -1,14 +1,80 @@
+import copy
 import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import click
+import numpy as np
 import yaml
+from tqdm import tqdm
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+try:
+    from turbojpeg import TurboJPEG
+except ImportError:  # optional, OpenCV is used for JPEG decode/encode instead
+    TurboJPEG = None
+
+JPEG_SUFFIXES: Tuple[str, ...] = (".jpg", ".jpeg")
+IMAGE_SUFFIXES: FrozenSet[str] = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".webp"})
+# bytes that separate values in a label file
+_WHITESPACE: np.ndarray = np.frombuffer(b" \t\r\n\v\f", dtype=np.uint8)
+
+
+def get_cv2_threads() -> int:
+    """Return the OpenCV thread count requested through ``BSORT_CV2_THREADS``.
+
+    Returns:
+        The configured thread count, or 0 (OpenCV threading disabled) if the
+        variable is unset or not an integer.
+    """
+    value: str = os.environ.get("BSORT_CV2_THREADS", "0")
+    try:
+        return int(value)
+    except ValueError:
+        click.echo(
+            click.style(f"Ignoring BSORT_CV2_THREADS={value!r}: not an integer", fg="yellow")
+        )
+        return 0
+
+
+@lru_cache(maxsize=32)
+def _load_config_cached(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file, cached on its path and modification time."""
+    del mtime_ns  # only part of the cache key
+    # bytes skip Python-level decoding, libyaml detects the encoding itself
+    with open(config_path, "rb") as f:
+        config: Dict[str, Any] = yaml.load(f, Loader=SafeLoader)
+    return config
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from YAML file.
 
+    Parsed files are cached on their absolute path and modification time, so
+    repeated loads of an unchanged file skip YAML parsing while edits are
+    picked up immediately. Each call returns an independent copy.
+
     Args:
         config_path: Path to the YAML configuration file.
 
@@ -23,9 +89,8 @@ def load_config(config_path: str) -> Dict[str, Any]:
         >>> config = load_config('config.yaml')
         >>> print(config['base_path'])
     """
-    with open(config_path, "r") as f:
-        config: Dict[str, Any] = yaml.safe_load(f)
-    return config
+    path: str = os.path.abspath(config_path)
+    return copy.deepcopy(_load_config_cached(path, os.stat(path).st_mtime_ns))
 
 
 def check_augmentation_exists(base_path: str, split: str = "train") -> bool:
@@ -37,15 +102,129 @@ def check_augmentation_exists(base_path: str, split: str = "train") -> bool:
             Defaults to 'train'.
 
     Returns:
-        True if the augmentation directory exists and contains files,
-        False otherwise.
+        True if the augmentation directory exists and contains at least
+        one file, False otherwise.
 
     Examples:
         >>> if check_augmentation_exists('/path/to/data', 'train'):
         ...     print("Augmented data available")
     """
-    aug_path: Path = Path(base_path) / "relabel_aug" / split / "images"
-    return aug_path.exists() and len(list(aug_path.glob("*"))) > 0
+    aug_path: str = os.path.join(base_path, "relabel_aug", split, "images")
+    if not os.path.isdir(aug_path):
+        return False
+
+    # stop at the first file instead of listing the whole directory
+    with os.scandir(aug_path) as it:
+        return any(e.is_file() for e in it)
+
+
+def is_image(name: str, exts: Collection[str] = IMAGE_SUFFIXES) -> bool:
+    """Check whether a file name has an image extension.
+
+    Args:
+        name: File name or path.
+        exts: Lowercase extensions, including the dot, to accept. Defaults to
+            ``IMAGE_SUFFIXES``.
+
+    Returns:
+        True if the extension, compared case-insensitively, is in ``exts``.
+
+    Examples:
+        >>> is_image('IMG_001.JPG')
+        True
+    """
+    return os.path.splitext(name)[1].lower() in exts
+
+
+def iter_images(directory: str, exts: Collection[str] = IMAGE_SUFFIXES) -> Iterator[str]:
+    """Lazily yield image file paths from a directory.
+
+    Uses a single ``os.scandir`` pass, which reuses the file type information
+    returned with the directory listing instead of a stat call per entry.
+    Extensions are matched case-insensitively. Paths come in directory order,
+    so large directories can be consumed without holding the whole listing.
+
+    Args:
+        directory: Directory to list.
+        exts: Lowercase file extensions to include. Defaults to
+            ``IMAGE_SUFFIXES`` (.jpg, .jpeg, .png, .bmp and .webp).
+
+    Yields:
+        Image file paths.
+
+    Raises:
+        FileNotFoundError: If the directory does not exist (on first iteration).
+
+    Examples:
+        >>> for path in iter_images('unseen'):
+        ...     print(path)
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if is_image(entry.name, exts) and entry.is_file():
+                yield entry.path
+
+
+def list_images(directory: str, exts: Collection[str] = IMAGE_SUFFIXES) -> List[str]:
+    """List image files in a directory.
+
+    Sorted counterpart of ``iter_images``.
+
+    Args:
+        directory: Directory to list.
+        exts: Lowercase file extensions to include. Defaults to
+            ``IMAGE_SUFFIXES`` (.jpg, .jpeg, .png, .bmp and .webp).
+
+    Returns:
+        Sorted list of image file paths.
+
+    Raises:
+        FileNotFoundError: If the directory does not exist.
+
+    Examples:
+        >>> images = list_images('relabel/train/images')
+        >>> print(f"Found {len(images)} images")
+    """
+    return sorted(iter_images(directory, exts))
+
+
+def progress_bar(
+    iterable: Optional[Iterable] = None,
+    total: Optional[int] = None,
+    desc: str = "",
+    miniters: int = 1,
+) -> tqdm:
+    """Create a tqdm progress bar with throttled refreshes.
+
+    The bar redraws at most once per second and roughly every 0.5% of the
+    total, so terminal writes don't add up on fast loops. It is disabled
+    entirely when stderr is not a terminal, e.g. when output is piped.
+
+    Args:
+        iterable: Iterable to wrap. Defaults to None for manual updates.
+        total: Expected number of iterations. Defaults to ``len(iterable)``.
+        desc: Description shown in front of the bar.
+        miniters: Minimum progress between redraws, e.g. the batch size when
+            the bar advances a batch at a time. Defaults to 1.
+
+    Returns:
+        The configured tqdm instance.
+
+    Examples:
+        >>> for path in progress_bar(paths, desc="Processing images"):
+        ...     process(path)
+    """
+    if total is None and iterable is not None:
+        total = len(iterable)  # type: ignore[arg-type]
+    return tqdm(
+        iterable,
+        total=total,
+        desc=desc,
+        mininterval=1.0,
+        miniters=max(1, miniters, (total or 0) // 200),
+        smoothing=0.05,
+        disable=not sys.stderr.isatty(),
+    )
 
 
 def read_yolo_label(label_path: str) -> Tuple[List[List[float]], List[int]]:
@@ -62,25 +241,51 @@ def read_yolo_label(label_path: str) -> Tuple[List[List[float]], List[int]]:
             - List of bounding boxes, where each bbox is [x_center, y_center, width, height]
             - List of class IDs corresponding to each bounding box
 
+    Raises:
+        ValueError: If the file doesn't hold five numeric columns per line.
+
     Examples:
         >>> bboxes, classes = read_yolo_label('labels/image001.txt')
         >>> print(f"Found {len(bboxes)} objects")
 
     Note:
-        If the label file doesn't exist, returns empty lists for both
-        bounding boxes and classes.
+        If the label file doesn't exist or is empty, returns empty lists for
+        both bounding boxes and classes.
     """
-    bboxes: List[List[float]] = []
-    classes: List[int] = []
     if not os.path.exists(label_path):
-        return bboxes, classes
-
-    with open(label_path, "r") as f:
-        for line in f.readlines():
-            cls, xc, yc, w, h = line.strip().split()
-            bboxes.append([float(xc), float(yc), float(w), float(h)])
-            classes.append(int(cls))
-    return bboxes, classes
+        return [], []
+
+    with open(label_path, "rb") as f:
+        data: bytes = f.read()
+    if not data.strip():
+        return [], []
+
+    # tokenize the whole file in one C-level pass instead of parsing line by line
+    arr: np.ndarray = np.fromstring(data, dtype=np.float64, sep=" ")
+
+    # count non-blank lines on the raw bytes: the line index of every
+    # non-whitespace byte, with each change of index starting a new line
+    buf: np.ndarray = np.frombuffer(data, dtype=np.uint8)
+    line_ids: np.ndarray = np.cumsum(buf == ord("\n"))[~np.isin(buf, _WHITESPACE)]
+    n_lines: int = int(np.count_nonzero(np.diff(line_ids))) + 1
+    # reshaping alone would silently re-chunk files with missing columns or bad values
+    if arr.size != 5 * n_lines:
+        raise ValueError(f"Expected 5 numeric columns per line in {label_path}")
+    arr = arr.reshape(-1, 5)
+    return arr[:, 1:5].tolist(), arr[:, 0].astype(int).tolist()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write data to a temporary file in the same directory, then rename it to path."""
+    tmp_path: str = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
 
 
 def write_yolo_label(label_path: str, bboxes: List[List[float]], classes: List[int]) -> None:
@@ -107,11 +312,15 @@ def write_yolo_label(label_path: str, bboxes: List[List[float]], classes: List[i
         >>> write_yolo_label('output/label.txt', bboxes, classes)
 
     Note:
-        Coordinates are written with 6 decimal places of precision.
+        Coordinates are written with 6 decimal places of precision. The file
+        only appears under its name once fully written.
     """
-    with open(label_path, "w") as f:
-        for cls, bb in zip(classes, bboxes):
-            f.write(f"{cls} {bb[0]:.6f} {bb[1]:.6f} {bb[2]:.6f} {bb[3]:.6f}\n")
+    # built in memory and written once
+    lines: str = "".join(
+        f"{int(cls)} {bb[0]:.6f} {bb[1]:.6f} {bb[2]:.6f} {bb[3]:.6f}\n"
+        for cls, bb in zip(classes, bboxes)
+    )
+    _write_atomic(label_path, lines.encode())
 
 
 def create_dynamic_yolo_config(
@@ -172,7 +381,266 @@ def create_dynamic_yolo_config(
 
     output_file: Path = base_path / output_path
     with open(output_file, "w") as f:
-        yaml.dump(yolo_config, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(yolo_config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
 
     click.echo(f"✓ YOLO config created: {output_file}")
     return str(output_file)
+
+
+@lru_cache(maxsize=None)
+def _get_turbojpeg() -> Optional[Any]:
+    """Return a shared TurboJPEG instance, or None if libjpeg-turbo is unavailable."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError):
+        return None
+
+
+def _exif_orientation(data: bytes) -> int:
+    """Return the EXIF orientation tag of a JPEG, or 1 (upright) if it has none.
+
+    Only the segments before the image data are scanned, so this is cheap
+    compared to decoding.
+    """
+    pos: int = 2
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker: int = data[pos + 1]
+        if marker == 0xDA:  # start of scan, no metadata follows
+            break
+        if marker == 0xE1 and data[pos + 4 : pos + 10] == b"Exif\0\0":
+            tiff: int = pos + 10
+            order: str = "little" if data[tiff : tiff + 2] == b"II" else "big"
+            ifd: int = tiff + int.from_bytes(data[tiff + 4 : tiff + 8], order)
+            count: int = int.from_bytes(data[ifd : ifd + 2], order)
+            for entry in range(ifd + 2, ifd + 2 + 12 * count, 12):
+                if int.from_bytes(data[entry : entry + 2], order) == 0x0112:
+                    return int.from_bytes(data[entry + 8 : entry + 10], order)
+            return 1
+        pos += 2 + int.from_bytes(data[pos + 2 : pos + 4], "big")
+    return 1
+
+
+def read_image(image_path: str) -> Optional[np.ndarray]:
+    """Read an image from disk in BGR channel order.
+
+    JPEG files are decoded with libjpeg-turbo through PyTurboJPEG when it is
+    installed, which is considerably faster than OpenCV's generic codecs.
+    Other formats, environments without libjpeg-turbo and JPEGs with an EXIF
+    rotation, which libjpeg-turbo ignores, use ``cv2.imdecode``, so images come
+    out the same way up as with ``cv2.imread``.
+
+    Args:
+        image_path: Path to the image file.
+
+    Returns:
+        The decoded image as a (H, W, 3) uint8 array, or None if the file
+        cannot be read or decoded.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+
+    Examples:
+        >>> image = read_image('images/image001.jpg')
+        >>> print(image.shape)
+    """
+    # imported on first use so importing the helpers doesn't load OpenCV
+    import cv2
+
+    try:
+        with open(image_path, "rb") as f:
+            data: bytes = f.read()
+    except FileNotFoundError:
+        raise
+    except OSError:
+        return None
+    if not data:
+        return None
+
+    jpeg = _get_turbojpeg()
+    if (
+        jpeg is not None
+        and str(image_path).lower().endswith(JPEG_SUFFIXES)
+        and _exif_orientation(data) == 1
+    ):
+        try:
+            return jpeg.decode(data)
+        except OSError:
+            return None
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def write_image(
+    image_path: str, image: np.ndarray, quality: int = 95, optimize: bool = True
+) -> bool:
+    """Write a BGR image to disk.
+
+    JPEG files are encoded with libjpeg-turbo through PyTurboJPEG when it is
+    installed, otherwise with ``cv2.imencode``, optionally with Huffman table
+    optimization. The encoded buffer is written to a temporary file next to
+    the output and renamed into place, so an interrupted run never leaves a
+    truncated image that a resumed run would take as finished.
+
+    Args:
+        image_path: Output path; the extension selects the format.
+        image: Image as a (H, W, 3) uint8 array in BGR channel order.
+        quality: JPEG quality from 0 to 100, ignored for other formats.
+            Defaults to 95, OpenCV's default.
+        optimize: Whether OpenCV builds optimized Huffman tables for JPEG
+            outputs, which makes files a few percent smaller but encoding
+            slower. Defaults to True.
+
+    Returns:
+        True if the image was written, False if it could not be encoded.
+
+    Raises:
+        OSError: If the file cannot be written.
+
+    Examples:
+        >>> write_image('output/image001.jpg', image, quality=85)
+    """
+    import cv2
+
+    is_jpeg: bool = str(image_path).lower().endswith(JPEG_SUFFIXES)
+    jpeg = _get_turbojpeg()
+    if jpeg is not None and is_jpeg:
+        buf: Any = jpeg.encode(image, quality=quality)
+    else:
+        params: List[int] = (
+            [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, int(optimize)]
+            if is_jpeg
+            else []
+        )
+        ok, buf = cv2.imencode(os.path.splitext(str(image_path))[1], image, params)
+        if not ok:
+            return False
+
+    _write_atomic(image_path, buf)
+    return True
+
+
+class PrefetchReader(threading.Thread):
+    """Read images and their YOLO labels ahead of time in a background thread.
+
+    Decoding runs on the reader thread while the consumer is busy with the
+    previously read image, hiding disk and JPEG decode latency behind compute.
+
+    Args:
+        image_paths: Paths of the images to read, in order.
+        label_dir: Directory containing the YOLO label files, matched to the
+            images by file stem.
+        num_prefetch: Maximum number of decoded images held in the queue.
+            Defaults to 4.
+
+    Yields:
+        Tuples of (image_path, image, bboxes, classes), where image is None if
+        the file is missing or could not be decoded.
+
+    Examples:
+        >>> for path, image, bboxes, classes in PrefetchReader(paths, 'labels'):
+        ...     print(path, image.shape, len(bboxes))
+    """
+
+    _SENTINEL = object()
+
+    def __init__(self, image_paths: Sequence[Path], label_dir: Path, num_prefetch: int = 4):
+        super().__init__(daemon=True)
+        self.image_paths: List[Path] = [Path(p) for p in image_paths]
+        self.label_dir: Path = Path(label_dir)
+        self.queue: queue.Queue = queue.Queue(maxsize=num_prefetch)
+        self.start()
+
+    def run(self) -> None:
+        try:
+            for path in self.image_paths:
+                image: Optional[np.ndarray]
+                try:
+                    image = read_image(str(path))
+                except FileNotFoundError:
+                    image = None
+                label_path: Path = self.label_dir / path.with_suffix(".txt").name
+                bboxes, classes = read_yolo_label(str(label_path))
+                self.queue.put((path, image, bboxes, classes))
+        except Exception as e:
+            self.queue.put(e)
+        self.queue.put(self._SENTINEL)
+
+    def __iter__(self) -> Iterator[Tuple[Path, Optional[np.ndarray], List[List[float]], List[int]]]:
+        while True:
+            item = self.queue.get()
+            if item is self._SENTINEL:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class IOConsumer:
+    """Write images and YOLO labels on a pool of background threads.
+
+    Items are dictionaries with the keys ``out_path``, ``img``, ``label_path``,
+    ``bboxes`` and ``classes``; items without ``label_path`` only write the
+    image. Encoding and writing run on a thread pool so the
+    producer doesn't wait on them. Failed writes are collected in ``errors``
+    once the consumer is closed instead of interrupting the producer.
+
+    Args:
+        num_workers: Number of writer threads. Defaults to 4.
+        maxsize: Maximum number of pending items before ``put`` blocks.
+            Defaults to 16.
+        jpeg_quality: JPEG quality used for ``.jpg`` outputs. Defaults to 95.
+        optimize: Whether JPEG outputs get optimized Huffman tables, see
+            ``write_image``. Defaults to True.
+
+    Examples:
+        >>> with IOConsumer() as writer:
+        ...     writer.put({'out_path': 'a.jpg', 'img': img,
+        ...                 'label_path': 'a.txt', 'bboxes': [], 'classes': []})
+        >>> print(writer.errors)
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 4,
+        maxsize: int = 16,
+        jpeg_quality: int = 95,
+        optimize: bool = True,
+    ):
+        self.jpeg_quality: int = jpeg_quality
+        self.optimize: bool = optimize
+        self.errors: List[Tuple[str, BaseException]] = []
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=num_workers)
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(maxsize)
+        self._futures: List[Tuple[str, Future]] = []
+
+    def _write(self, item: Dict[str, Any]) -> None:
+        try:
+            if not write_image(
+                str(item["out_path"]), item["img"], self.jpeg_quality, self.optimize
+            ):
+                raise IOError(f"Could not encode {item['out_path']}")
+            if item.get("label_path") is not None:
+                write_yolo_label(str(item["label_path"]), item["bboxes"], item["classes"])
+        finally:
+            self._slots.release()
+
+    def put(self, item: Dict[str, Any]) -> None:
+        """Queue an image and, if given, its label for writing."""
+        self._slots.acquire()
+        self._futures.append((str(item["out_path"]), self._executor.submit(self._write, item)))
+
+    def close(self) -> None:
+        """Wait until every queued item has been written and collect errors."""
+        self._executor.shutdown(wait=True)
+        for out_path, future in self._futures:
+            error: Optional[BaseException] = future.exception()
+            if error is not None:
+                self.errors.append((out_path, error))
+        self._futures.clear()
+
+    def __enter__(self) -> "IOConsumer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
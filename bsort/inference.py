@@ -1,13 +1,115 @@
-import glob
+import json
 import os
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 import click
-import cv2
-from tqdm import tqdm
-from ultralytics import YOLO
+import numpy as np
+import yaml
 
-from .helper import load_config
+from .helper import IOConsumer, get_cv2_threads, iter_images, load_config, progress_bar, read_image
+
+PRECISIONS: Tuple[str, ...] = ("fp32", "fp16", "int8")
+
+
+@lru_cache(maxsize=4)
+def _get_model(model_path: str, mtime_ns: int, half: bool) -> Any:
+    """Load a YOLO model, cached on its path, modification time and backend setup.
+
+    Repeated ``run_inference`` calls in one process reuse the loaded model,
+    while retrained weights written to the same path are picked up. Ultralytics
+    fixes ``half`` in the predictor's backend on the first call, so it is part
+    of the key as well and a change gets a fresh model.
+    """
+    del mtime_ns, half  # only part of the cache key
+    from ultralytics import YOLO
+
+    return YOLO(model_path)
+
+
+def _find_int8_model(model_path: str) -> Optional[str]:
+    """Locate an INT8 export of a model.
+
+    Looks for the OpenVINO directory or TensorRT engine that ``yolo export``
+    writes next to the weights with ``int8=True``.
+
+    Args:
+        model_path: Path to the model weights, or to an INT8 export itself.
+
+    Returns:
+        Path to the INT8 model, or None if no export exists.
+    """
+    if model_path.endswith((".engine", "_int8_openvino_model")):
+        return model_path if os.path.exists(model_path) else None
+
+    stem: str = os.path.splitext(model_path)[0]
+    for candidate in (f"{stem}_int8_openvino_model", f"{stem}.engine"):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _export_batch(model_path: str) -> Optional[int]:
+    """Read the batch size an exported model was built for.
+
+    Static exports (the default for ``yolo export``, INT8 included) only accept
+    that many images per call, and Ultralytics 8.3 passes larger lists through
+    unsplit. The size comes from the metadata Ultralytics stores with the
+    export: ``metadata.yaml`` next to OpenVINO models and a JSON header in
+    TensorRT engines.
+
+    Args:
+        model_path: Path to the model weights or export.
+
+    Returns:
+        The export's batch size, or None for PyTorch weights and dynamic exports,
+        which take any number of images. Exports without readable metadata are
+        treated as batch 1.
+    """
+    if model_path.endswith(".pt"):
+        return None
+
+    try:
+        if model_path.endswith(".engine"):
+            with open(model_path, "rb") as f:
+                meta_len: int = int.from_bytes(f.read(4), byteorder="little")
+                metadata: Dict[str, Any] = json.loads(f.read(meta_len))
+        else:
+            meta_dir: str = model_path if os.path.isdir(model_path) else os.path.dirname(model_path)
+            with open(os.path.join(meta_dir, "metadata.yaml"), "rb") as f:
+                metadata = yaml.safe_load(f)
+        if metadata.get("args", {}).get("dynamic"):
+            return None
+        return int(metadata.get("batch", 1))
+    except (OSError, ValueError, AttributeError, yaml.YAMLError):
+        return 1
+
+
+def _decode_ahead(
+    paths: Iterator[str], executor: ThreadPoolExecutor, window: int
+) -> Iterator[Tuple[str, Optional[np.ndarray]]]:
+    """Decode images on a thread pool, keeping a window of reads in flight.
+
+    Args:
+        paths: Image paths to decode, consumed lazily.
+        executor: Thread pool running the decodes.
+        window: Number of images decoded ahead of the consumer.
+
+    Yields:
+        Tuples of (path, image) in input order, where image is None if the
+        file could not be decoded.
+    """
+    pending: Deque[Tuple[str, Future]] = deque(
+        (path, executor.submit(read_image, path)) for path in islice(paths, window)
+    )
+    while pending:
+        path, future = pending.popleft()
+        for next_path in islice(paths, 1):
+            pending.append((next_path, executor.submit(read_image, next_path)))
+        yield path, future.result()
 
 
 def run_inference(
@@ -62,10 +164,18 @@ def run_inference(
     Note:
         - If neither image nor dir is specified, the function attempts to use
           the default image directory from the config file.
-        - Only .jpg images are processed when using directory mode.
+        - Only .jpg, .jpeg, .png, .bmp and .webp images are processed when using
+          directory mode.
         - The --save flag creates output in 'runs/detect/predict/' directory.
         - The --show flag requires a display environment (won't work headless).
     """
+    # imported here so loading the module (and the CLI) stays fast
+    import cv2
+
+    # keep OpenCV on the calling thread unless BSORT_CV2_THREADS says otherwise, so
+    # its own threads don't compete with the decode pool
+    cv2.setNumThreads(get_cv2_threads())
+
     click.echo(click.style("\n=== Inference ===", fg="cyan", bold=True))
 
     try:
@@ -75,84 +185,186 @@ def run_inference(
         infer_settings: Dict[str, Any] = settings.get("inference", {})
         model_path: str = model or infer_settings.get("model", "runs/detect/train/weights/best.pt")
         confidence: float = conf or infer_settings.get("conf", 0.25)
+        batch_size: int = infer_settings.get("batch", 16)
+        precision: str = infer_settings.get("precision", "fp16")
 
-        image_paths: List[str] = []
-        if image:
-            if not os.path.exists(image):
-                click.echo(click.style(f"Image not found: {image}", fg="red"))
+        if precision not in PRECISIONS:
+            click.echo(
+                click.style(
+                    f"Unknown precision: {precision} (expected one of {', '.join(PRECISIONS)})",
+                    fg="red",
+                )
+            )
+            raise click.Abort()
+
+        if precision == "int8":
+            int8_path: Optional[str] = _find_int8_model(model_path)
+            if int8_path is None:
+                click.echo(click.style(f"No INT8 export found for {model_path}", fg="red"))
+                click.echo(
+                    f"Export one with: yolo export model={model_path} format=openvino int8=True"
+                )
                 raise click.Abort()
-            image_paths = [image]
+            model_path = int8_path
+
+        # images are streamed from the directory, only their count is taken up front
+        image_dir: Optional[str] = None
+        total: int = 0
+        if image:
+            total = 1
         elif dir:
-            if not os.path.exists(dir):
+            image_dir = dir
+            try:
+                total = sum(1 for _ in iter_images(image_dir))
+            except FileNotFoundError:
                 click.echo(click.style(f"Directory not found: {dir}", fg="red"))
                 raise click.Abort()
-            image_paths = glob.glob(os.path.join(dir, "*.jpg"))
-            if not image_paths:
-                click.echo(click.style(f"No .jpg images found in {dir}", fg="red"))
+            if not total:
+                click.echo(click.style(f"No images found in {dir}", fg="red"))
                 raise click.Abort()
         else:
             default_dir: str = infer_settings.get("image_dir", "unseen")
-            if os.path.exists(default_dir):
-                image_paths = glob.glob(os.path.join(default_dir, "*.jpg"))
+            try:
+                total = sum(1 for _ in iter_images(default_dir))
+                image_dir = default_dir
+            except FileNotFoundError:
+                pass
 
-            if not image_paths:
+            if not total:
                 click.echo(click.style("No images specified. Use --image or --dir", fg="red"))
                 raise click.Abort()
 
+        # checked up front, Ultralytics would otherwise try to download unknown names
         if not os.path.exists(model_path):
             click.echo(click.style(f"Model not found: {model_path}", fg="red"))
             raise click.Abort()
 
+        # static exports reject calls with more images than they were built for
+        export_batch: Optional[int] = _export_batch(model_path)
+        batch_note: str = ""
+        if export_batch is not None and export_batch < batch_size:
+            batch_size = export_batch
+            batch_note = " (fixed by the export)"
+
         click.echo(f"Model: {model_path}")
-        click.echo(f"Images: {len(image_paths)}")
+        click.echo(f"Images: {total}")
         click.echo(f"Confidence threshold: {confidence}")
+        click.echo(f"Batch size: {batch_size}{batch_note}")
+        click.echo(f"Precision: {precision}")
+
+        import torch
 
-        click.echo("Loading model...")
-        yolo_model: YOLO = YOLO(model_path)
+        # fixed input size, so let cuDNN pick the fastest convolution algorithms
+        torch.backends.cudnn.benchmark = True
+        # FP16 kernels only exist on the GPU, elsewhere fp16 falls back to fp32
+        half: bool = precision == "fp16" and torch.cuda.is_available()
+
+        predict_kwargs: Dict[str, Any] = {"conf": confidence, "half": half, "verbose": False}
 
         # show the image result if --show enabled
         if show:
             import matplotlib.pyplot as plt
 
-        click.echo("Running inference...\n")
-
-        for path in tqdm(image_paths, desc="Processing images"):
-            result = yolo_model(path, conf=confidence)[0]
-
-            boxes = result.boxes
-            click.echo(f"\n{os.path.basename(path)}:")
-
-            if len(boxes) > 0:
-                for box in boxes:
-                    cls: int = int(box.cls[0])
-                    conf_score: float = float(box.conf[0])
-                    class_name: str = result.names[cls]
-                    click.echo(f"  • {class_name}: {conf_score:.2f}")
-            else:
-                click.echo("  No detections")
-
-            # Save or show results
-            if save:
-                img = result.plot()
-                output_dir: str = "runs/detect/predict"
-                os.makedirs(output_dir, exist_ok=True)
-                output_path: str = os.path.join(output_dir, os.path.basename(path))
-                cv2.imwrite(output_path, img)
-
-            if show:
-                img = result.plot()
-                rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                plt.figure(figsize=(12, 8))
-                plt.imshow(rgb)
-                plt.title(os.path.basename(path))
-                plt.axis("off")
-                plt.show()
-
+        output_dir: str = "runs/detect/predict"
         if save:
-            click.echo(click.style(f"Results saved to runs/detect/predict/", fg="green"))
+            os.makedirs(output_dir, exist_ok=True)
+
+        inference_ms: float = 0.0
+        processed: int = 0
+        image_iter: Iterator[str] = iter_images(image_dir) if image_dir else iter([image])
+        with torch.inference_mode(), ThreadPoolExecutor(
+            max_workers=os.cpu_count()
+        ) as executor, IOConsumer(jpeg_quality=90, optimize=False) as writer:
+            # JPEG decoding overlaps with the model running on the previous batch
+            decoded: Iterator[Tuple[str, Optional[np.ndarray]]] = _decode_ahead(
+                image_iter, executor, window=2 * batch_size
+            )
+            # the first image is taken before the model loads, so a mistyped path
+            # fails early
+            try:
+                first: Tuple[str, Optional[np.ndarray]] = next(decoded)
+            except FileNotFoundError as e:
+                click.echo(click.style(f"Image not found: {e.filename}", fg="red"))
+                raise click.Abort()
+            decoded = chain([first], decoded)
+
+            click.echo("Loading model...")
+            yolo_model: Any = _get_model(model_path, os.stat(model_path).st_mtime_ns, half)
+
+            click.echo("Running inference...\n")
+            with progress_bar(total=total, desc="Processing images", miniters=batch_size) as pbar:
+                while batch := list(islice(decoded, batch_size)):
+                    batch_names: List[str] = []
+                    arrays: List[np.ndarray] = []
+                    for path, img in batch:
+                        if img is None:
+                            click.echo(f"Warning: Could not read {path}")
+                            continue
+                        batch_names.append(os.path.basename(path))
+                        arrays.append(img)
+
+                    if not arrays:
+                        pbar.update(len(batch))
+                        continue
+
+                    # stream yields each result as soon as it is post-processed
+                    results = yolo_model(arrays, stream=True, **predict_kwargs)
+
+                    for name, result in zip(batch_names, results):
+                        inference_ms += result.speed["inference"]
+                        processed += 1
+
+                        # one device-to-host copy per result instead of one per box
+                        boxes = result.boxes
+                        cls_arr: np.ndarray = boxes.cls.cpu().numpy().astype(np.int32)
+                        conf_arr: np.ndarray = boxes.conf.cpu().numpy()
+
+                        lines: List[str] = [f"\n{name}:"]
+                        if len(cls_arr) > 0:
+                            lines.extend(
+                                f"  • {result.names[c]}: {s:.2f}" for c, s in zip(cls_arr, conf_arr)
+                            )
+                        else:
+                            lines.append("  No detections")
+                        click.echo("\n".join(lines))
+
+                        # Save or show results
+                        if save or show:
+                            img = result.plot()
+
+                        if save:
+                            # encoded in the background, leaving the model free for the next batch
+                            writer.put({"out_path": os.path.join(output_dir, name), "img": img})
+
+                        if show:
+                            plt.figure(figsize=(12, 8))
+                            # reversed channel view, matplotlib expects RGB
+                            plt.imshow(img[..., ::-1])
+                            plt.title(name)
+                            plt.axis("off")
+                            plt.show()
+
+                    pbar.update(len(batch))
+
+        if not processed:
+            click.echo(click.style("No images could be read", fg="red"))
+            raise click.Abort()
+
+        click.echo(f"\nAverage inference time: {inference_ms / processed:.1f}ms per image")
+
+        for out_path, e in writer.errors:
+            click.echo(click.style(f"Could not save {out_path}: {e}", fg="red"))
+
+        if save and writer.errors:
+            click.echo(click.style(f"{len(writer.errors)} results could not be saved", fg="red"))
+        elif save:
+            click.echo(click.style(f"Results saved to {output_dir}/", fg="green"))
 
         click.echo(click.style("Inference completed!", fg="green", bold=True))
 
+    except click.Abort:
+        # the reason was already reported
+        raise
     except FileNotFoundError as e:
         click.echo(click.style(f"File not found: {e}", fg="red"))
         raise click.Abort()
@@ -1,13 +1,83 @@
 import os
-from typing import Any, Dict, Optional
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 import click
-import wandb
-from ultralytics import YOLO
 
 from .helper import create_dynamic_yolo_config, load_config
 
 
+def _launch_ddp(
+    config_path: str, epochs: int, device_setting: str, batch_size: int, imgsz: int
+) -> None:
+    """Run training as one torchrun process per GPU.
+
+    Each process runs ``bsort.model_train_worker``, which calls ``run_training``
+    again with ``LOCAL_RANK`` set, so Ultralytics trains as that DDP rank
+    instead of spawning processes itself.
+
+    Args:
+        config_path: Path to the YAML configuration file.
+        epochs: Number of training epochs.
+        device_setting: Comma-separated GPU ids, e.g. '0,1'.
+        batch_size: Total batch size across all GPUs, -1 for auto.
+        imgsz: Input image size.
+
+    Raises:
+        subprocess.CalledProcessError: If any rank exits with an error.
+    """
+    gpu_ids: List[str] = [d.strip() for d in device_setting.split(",") if d.strip()]
+    num_gpus: int = len(gpu_ids)
+    cmd: List[str] = [
+        sys.executable,
+        "-m",
+        "torch.distributed.run",
+        "--standalone",
+        f"--nproc_per_node={num_gpus}",
+        "-m",
+        "bsort.model_train_worker",
+        f"--config={config_path}",
+        f"--epochs={epochs}",
+        f"--device={','.join(gpu_ids)}",
+        f"--batch={batch_size}",
+        f"--imgsz={imgsz}",
+    ]
+    # ranks pick cuda:LOCAL_RANK, which must index into the requested GPUs
+    env: Dict[str, str] = {**os.environ, "CUDA_VISIBLE_DEVICES": ",".join(gpu_ids)}
+    click.echo(f"Launching {num_gpus} training processes with torchrun...")
+    subprocess.run(cmd, check=True, env=env)
+
+
+def _limit_cpu_threads(device_setting: str) -> None:
+    """Keep BLAS threads from competing with the dataloader on GPU runs.
+
+    On GPU runs the CPU only feeds the dataloader workers, and per-process BLAS
+    thread pools oversubscribe the cores they run on. The device is judged from
+    ``device_setting`` alone, without initialising CUDA, so an empty (auto)
+    setting is left alone. Must run before torch is imported, since OpenMP and
+    MKL read these variables once at load time. Thread counts already set in
+    the environment are left alone.
+
+    Args:
+        device_setting: Training device string, e.g. '', 'cpu', '0' or '0,1'.
+    """
+    if device_setting.strip().lower() in ("", "cpu", "mps"):
+        return
+
+    set_omp: bool = False
+    # inherited by the per-GPU processes torchrun starts
+    if "OMP_NUM_THREADS" not in os.environ:
+        os.environ["OMP_NUM_THREADS"] = "1"
+        set_omp = True
+    if "MKL_NUM_THREADS" not in os.environ:
+        os.environ["MKL_NUM_THREADS"] = "1"
+    if set_omp and "torch" in sys.modules:
+        # torch was loaded earlier in this process and won't reread the variable
+        sys.modules["torch"].set_num_threads(1)
+
+
 def run_training(
     config_path: str,
     epochs: Optional[int] = None,
@@ -63,19 +133,23 @@ def run_training(
           augmented data if available, otherwise falls back to raw training data.
         - Training results are saved in the project directory specified in config
           or defaults to 'runs/detect/train'.
+        - A comma-separated device list (e.g. '0,1') runs one torchrun process per
+          GPU; only the first rank logs to WandB.
     """
     try:
         settings: Dict[str, Any] = load_config(config_path)
         click.echo(f"Loaded config: {config_path}")
 
-        yolo_config_path: str = create_dynamic_yolo_config(settings)
-
         train_settings: Dict[str, Any] = settings.get("training", {})
         model_name: str = train_settings.get("model", "yolov9t.pt")
         epochs_val: int = epochs or train_settings.get("epochs", 100)
         imgsz_val: int = imgsz or train_settings.get("imgsz", 640)
         batch_size: int = batch or train_settings.get("batch", -1)
         device_setting: str = device or train_settings.get("device", "")
+        cache_mode: Any = train_settings.get("cache", False)
+        workers: Optional[int] = train_settings.get("workers")
+        if workers is None:
+            workers = (os.cpu_count() or 2) // 2
 
         wandb_settings: Dict[str, Any] = settings.get("wandb", {})
         use_wandb: bool = wandb_settings.get("enabled", True)
@@ -83,6 +157,27 @@ def run_training(
         wandb_entity: Optional[str] = wandb_settings.get("entity", None)
         wandb_name: Optional[str] = wandb_settings.get("name", None)
 
+        # set by torchrun when this process is one DDP rank of a multi-GPU run
+        distributed: bool = "LOCAL_RANK" in os.environ
+        main_rank: bool = int(os.environ.get("RANK", "0")) == 0
+
+        if distributed:
+            # written by the launching process, so ranks don't race to rewrite it
+            yolo_config_path: str = str(
+                Path(settings.get("base_path", ".")) / "config_dynamic.yaml"
+            )
+        else:
+            yolo_config_path = create_dynamic_yolo_config(settings)
+
+        if "," in device_setting and not distributed:
+            _limit_cpu_threads(device_setting)
+            _launch_ddp(config_path, epochs_val, device_setting, batch_size, imgsz_val)
+            click.echo(click.style("\n✓ Training completed successfully!", fg="green", bold=True))
+            return
+
+        # only the first rank reports to WandB
+        use_wandb = use_wandb and main_rank
+
         if use_wandb:
             wandb_api_key: Optional[str] = os.getenv("WANDB_API_KEY")
             if not wandb_api_key:
@@ -97,18 +192,23 @@ def run_training(
             else:
                 click.echo(click.style("✓ WandB enabled", fg="green"))
 
+                wandb_config: Dict[str, Any] = {
+                    "model": model_name,
+                    "epochs": epochs_val,
+                    "imgsz": imgsz_val,
+                    "batch": batch_size,
+                    "device": device_setting or "auto",
+                }
+                import wandb
+
+                # repeated calls in one process (e.g. sweeps) close the previous run
                 wandb.init(
                     project=wandb_project,
                     entity=wandb_entity,
                     name=wandb_name,
-                    config={
-                        "model": model_name,
-                        "epochs": epochs_val,
-                        "imgsz": imgsz_val,
-                        "batch": batch_size,
-                        "device": device_setting or "auto",
-                    },
+                    config=wandb_config,
                     tags=["yolo", "object-detection"],
+                    reinit="finish_previous",
                 )
                 click.echo(f"WandB project: {wandb_project}")
                 if wandb_entity:
@@ -119,6 +219,13 @@ def run_training(
         click.echo(f"Image size: {imgsz_val}")
         click.echo(f'Batch size: {batch_size if batch_size > 0 else "auto"}')
         click.echo(f'Device: {device_setting or "auto"}')
+        click.echo(f"Dataloader workers: {workers}")
+        click.echo(f"Dataset cache: {cache_mode or 'off'}")
+
+        _limit_cpu_threads(device_setting)
+        # imported after the thread limits are set, and here so loading the
+        # module (and the CLI) stays fast
+        from ultralytics import YOLO
 
         click.echo("initializing model...")
         model: YOLO = YOLO(model_name)
@@ -127,6 +234,7 @@ def run_training(
             "data": yolo_config_path,
             "epochs": epochs_val,
             "imgsz": imgsz_val,
+            "workers": workers,
         }
 
         if batch_size > 0:
@@ -135,6 +243,10 @@ def run_training(
         if device_setting:
             train_params["device"] = device_setting
 
+        # decoded images are kept between epochs instead of re-reading the JPEGs
+        if cache_mode in ("ram", "disk", True):
+            train_params["cache"] = cache_mode
+
         if "project" in train_settings:
             train_params["project"] = train_settings["project"]
         if "name" in train_settings:
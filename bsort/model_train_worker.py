@@ -0,0 +1,20 @@
+"""Per-GPU training entry point started by torchrun for multi-GPU runs."""
+
+import click
+
+from .model_train import run_training
+
+
+@click.command()
+@click.option("--config", "-c", required=True, help="Path to settings.yaml")
+@click.option("--epochs", "-e", required=True, type=int, help="Number of epochs")
+@click.option("--device", "-d", required=True, help="Comma-separated GPU ids (e.g., 0,1)")
+@click.option("--batch", "-b", required=True, type=int, help="Total batch size")
+@click.option("--imgsz", required=True, type=int, help="Image size")
+def main(config, epochs, device, batch, imgsz):
+    """Train one DDP rank."""
+    run_training(config, epochs, device, batch, imgsz)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
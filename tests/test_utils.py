@@ -1,15 +1,27 @@
 """Unit tests for utils module."""
 import os
 import tempfile
+import cv2
+import numpy as np
 import pytest
 import yaml
 from pathlib import Path
+from PIL import Image
 from bsort.helper import (
+    IOConsumer,
+    PrefetchReader,
+    is_image,
+    iter_images,
+    list_images,
     load_config,
+    read_image,
     read_yolo_label,
+    write_image,
     write_yolo_label,
     check_augmentation_exists,
+    get_cv2_threads,
 )
+from bsort.data_augmentation import run_augmentation
 
 
 def test_load_config():
@@ -20,7 +32,7 @@ def test_load_config():
             'input_dir': 'test_input',
             'names': {0: 'class1', 1: 'class2'}
         }
-        yaml.dump(config, f)
+        yaml.safe_dump(config, f)
         temp_file = f.name
     
     try:
@@ -32,6 +44,39 @@ def test_load_config():
         os.unlink(temp_file)
 
 
+def test_load_config_reloads_modified_file():
+    """Test that cached configs are reloaded after the file changes."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        yaml.safe_dump({'base_path': '.'}, f)
+        temp_file = f.name
+
+    try:
+        assert load_config(temp_file)['base_path'] == '.'
+
+        with open(temp_file, 'w') as f:
+            yaml.safe_dump({'base_path': '/data'}, f)
+        stat = os.stat(temp_file)
+        os.utime(temp_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert load_config(temp_file)['base_path'] == '/data'
+    finally:
+        os.unlink(temp_file)
+
+
+def test_load_config_returns_copies():
+    """Test that mutating a loaded config does not leak into later loads."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        yaml.safe_dump({'names': {0: 'class1'}}, f)
+        temp_file = f.name
+
+    try:
+        first = load_config(temp_file)
+        first['names'][0] = 'changed'
+        assert load_config(temp_file)['names'][0] == 'class1'
+    finally:
+        os.unlink(temp_file)
+
+
 def test_read_write_yolo_label():
     """Test reading and writing YOLO label files."""
     with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
@@ -62,6 +107,56 @@ def test_read_write_yolo_label():
         os.unlink(temp_file)
 
 
+def test_read_yolo_label_types():
+    """Test that labels are returned as plain Python lists, even for a single line."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        f.write("3 0.25 0.75 0.5 0.125\n")
+        temp_file = f.name
+
+    try:
+        bboxes, classes = read_yolo_label(temp_file)
+        assert bboxes == [[0.25, 0.75, 0.5, 0.125]]
+        assert classes == [3]
+        assert type(bboxes) is list and type(bboxes[0]) is list
+        assert all(type(v) is float for v in bboxes[0])
+        assert type(classes[0]) is int
+    finally:
+        os.unlink(temp_file)
+
+
+def test_list_images():
+    """Test listing image files in a directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ('b.jpg', 'a.JPEG', 'c.png', 'd.txt'):
+            (Path(tmpdir) / name).touch()
+        (Path(tmpdir) / 'e.jpg').mkdir()
+
+        images = list_images(tmpdir)
+        assert [os.path.basename(p) for p in images] == ['a.JPEG', 'b.jpg', 'c.png']
+        assert list_images(tmpdir, exts=('.png',)) == [os.path.join(tmpdir, 'c.png')]
+        assert sorted(iter_images(tmpdir)) == images
+
+    assert is_image('a.JPG') and is_image('dir/b.webp')
+    assert not is_image('c.txt') and not is_image('jpg')
+
+    with pytest.raises(FileNotFoundError):
+        list_images(os.path.join(tmpdir, 'missing'))
+
+
+def test_read_yolo_label_malformed():
+    """Test that lines without exactly five columns are rejected."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        # 30 tokens, a multiple of 5, spread over six-column lines
+        f.write("0 0.5 0.5 0.3 0.4 0.9\n" * 5)
+        temp_file = f.name
+
+    try:
+        with pytest.raises(ValueError):
+            read_yolo_label(temp_file)
+    finally:
+        os.unlink(temp_file)
+
+
 def test_read_yolo_label_nonexistent():
     """Test reading non-existent label file."""
     bboxes, classes = read_yolo_label('nonexistent_file.txt')
@@ -101,4 +196,156 @@ def test_write_yolo_label_empty():
         assert classes == []
     finally:
         if os.path.exists(temp_file):
-            os.unlink(temp_file)
\ No newline at end of file
+            os.unlink(temp_file)
+
+
+def test_get_cv2_threads(monkeypatch):
+    """Test parsing the OpenCV thread count from the environment."""
+    monkeypatch.delenv('BSORT_CV2_THREADS', raising=False)
+    assert get_cv2_threads() == 0
+    monkeypatch.setenv('BSORT_CV2_THREADS', '4')
+    assert get_cv2_threads() == 4
+    monkeypatch.setenv('BSORT_CV2_THREADS', 'four')
+    assert get_cv2_threads() == 0
+
+
+def test_read_write_image():
+    """Test reading and writing images."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        image = np.full((16, 16, 3), (255, 0, 0), dtype=np.uint8)
+        for name in ('image.jpg', 'image.png'):
+            path = os.path.join(tmpdir, name)
+            assert write_image(path, image) is True
+            loaded = read_image(path)
+            assert loaded.shape == image.shape
+            assert np.abs(loaded.astype(int) - image.astype(int)).max() < 8
+        assert sorted(os.listdir(tmpdir)) == ['image.jpg', 'image.png']
+
+        with pytest.raises(FileNotFoundError):
+            read_image(os.path.join(tmpdir, 'missing.jpg'))
+
+
+def test_read_image_exif_orientation():
+    """Test that JPEGs with an EXIF rotation are read upright."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'rotated.jpg')
+        image = Image.fromarray(np.zeros((16, 32, 3), dtype=np.uint8))
+        exif = image.getexif()
+        exif[0x0112] = 6
+        image.save(path, exif=exif.tobytes())
+
+        assert read_image(path).shape == cv2.imread(path).shape == (32, 16, 3)
+
+
+def test_prefetch_reader():
+    """Test reading images and labels ahead of time."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        img_dir = Path(tmpdir) / 'images'
+        lbl_dir = Path(tmpdir) / 'labels'
+        img_dir.mkdir()
+        lbl_dir.mkdir()
+
+        paths = []
+        for i in range(3):
+            path = img_dir / f'img{i}.jpg'
+            cv2.imwrite(str(path), np.full((8, 8, 3), i, dtype=np.uint8))
+            write_yolo_label(str(lbl_dir / f'img{i}.txt'), [[0.5, 0.5, 0.1, 0.1]], [i])
+            paths.append(path)
+        paths.append(img_dir / 'missing.jpg')
+
+        items = list(PrefetchReader(paths, lbl_dir, num_prefetch=1))
+        assert [item[0] for item in items] == paths
+        assert items[1][1].shape == (8, 8, 3)
+        assert items[1][2] == [[0.5, 0.5, 0.1, 0.1]]
+        assert items[1][3] == [1]
+        assert items[3][1] is None
+        assert items[3][2] == []
+
+
+def test_io_consumer():
+    """Test writing images and labels on background threads."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with IOConsumer(num_workers=2) as writer:
+            for i in range(4):
+                writer.put(
+                    {
+                        'out_path': Path(tmpdir) / f'img{i}.jpg',
+                        'img': np.zeros((8, 8, 3), dtype=np.uint8),
+                        'label_path': Path(tmpdir) / f'img{i}.txt',
+                        'bboxes': [[0.5, 0.5, 0.1, 0.1]],
+                        'classes': [i],
+                    }
+                )
+            writer.put(
+                {
+                    'out_path': Path(tmpdir) / 'missing' / 'img.jpg',
+                    'img': np.zeros((8, 8, 3), dtype=np.uint8),
+                    'label_path': Path(tmpdir) / 'missing' / 'img.txt',
+                    'bboxes': [],
+                    'classes': [],
+                }
+            )
+            writer.put(
+                {
+                    'out_path': Path(tmpdir) / 'image_only.jpg',
+                    'img': np.zeros((8, 8, 3), dtype=np.uint8),
+                }
+            )
+
+        assert (Path(tmpdir) / 'image_only.jpg').exists()
+        assert not (Path(tmpdir) / 'image_only.txt').exists()
+        for i in range(4):
+            assert cv2.imread(str(Path(tmpdir) / f'img{i}.jpg')).shape == (8, 8, 3)
+            assert read_yolo_label(str(Path(tmpdir) / f'img{i}.txt'))[1] == [i]
+        assert len(writer.errors) == 1
+
+
+def test_run_augmentation_resume_matches_fresh_run():
+    """Test that a seeded resume regenerates exactly the missing outputs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        img_dir = Path(tmpdir) / 'relabel' / 'train' / 'images'
+        lbl_dir = Path(tmpdir) / 'relabel' / 'train' / 'labels'
+        img_dir.mkdir(parents=True)
+        lbl_dir.mkdir(parents=True)
+        rng = np.random.default_rng(0)
+        for name, bboxes, classes in [('pos', [[0.5, 0.5, 0.2, 0.2]], [1]), ('neg', [], [])]:
+            cv2.imwrite(str(img_dir / f'{name}.jpg'), rng.integers(0, 255, (32, 32, 3), np.uint8))
+            write_yolo_label(str(lbl_dir / f'{name}.txt'), bboxes, classes)
+
+        config = {
+            'base_path': tmpdir,
+            'augmentation': {
+                'aug_per_image': 3,
+                'horizontal_flip': 0.5,
+                'rotation_limit': 20,
+                'brightness_contrast': 0.5,
+                'shift_limit': 0.05,
+                'scale_limit': 0.05,
+                'num_workers': 1,
+                'seed': 42,
+            },
+        }
+        config_file = Path(tmpdir) / 'settings.yaml'
+        config_file.write_text(yaml.safe_dump(config))
+
+        out_dir = Path(tmpdir) / 'relabel_aug' / 'train'
+
+        def snapshot():
+            return {
+                p.relative_to(out_dir): p.read_bytes()
+                for p in out_dir.rglob('*')
+                if p.is_file()
+            }
+
+        run_augmentation(str(config_file))
+        fresh = snapshot()
+        assert len(fresh) == 12
+
+        for name in ('pos_aug1', 'neg_aug1'):
+            (out_dir / 'images' / f'{name}.jpg').unlink()
+            (out_dir / 'labels' / f'{name}.txt').unlink()
+
+        run_augmentation(str(config_file))
+        assert snapshot() == fresh
+        # outputs of the same image stay distinct
+        assert fresh[Path('images/neg_aug0.jpg')] != fresh[Path('images/neg_aug1.jpg')]